@@ -1,14 +1,12 @@
-from datetime import timedelta
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 
 from app.core import security
-from app.core.config import settings
-from app.core.deps import get_current_user, get_current_active_user
-from app.db.database import get_db
+from app.core.config import ALGORITHM, SECRET_KEY_BYTES
+from app.core.deps import get_current_active_user
+from app.db.database import Session
 from app.models.user import User
 from app.schemas.token import Token, RefreshToken
 from app.schemas.user import User as UserSchema, UserCreate
@@ -18,69 +16,53 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=UserSchema)
-def register(
-    *,
-    db: Session = Depends(get_db),
-    user_in: UserCreate,
-) -> Any:
+async def register(user_in: UserCreate) -> Any:
     """
     Create new user.
     """
-    user = user_service.get_user_by_email(db, email=user_in.email)
+    user = await user_service.get_user_by_email(Session(), email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
-    user = user_service.create_user(db, user=user_in)
+    user = await user_service.create_user(Session(), user=user_in)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
-) -> Any:
+async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = user_service.authenticate_user(
-        db, email=form_data.username, password=form_data.password
+    user = await user_service.authenticate_user(
+        Session(), email=form_data.username, password=form_data.password
     )
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
-    elif not user_service.is_active(user):
+    elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    
+    access, refresh = security.mint_pair(user.id)
     return {
-        "access_token": security.create_access_token(
-            user.id, expires_delta=access_token_expires
-        ),
-        "refresh_token": security.create_refresh_token(
-            user.id, expires_delta=refresh_token_expires
-        ),
+        "access_token": access,
+        "refresh_token": refresh,
         "token_type": "bearer",
     }
 
 
 @router.post("/refresh", response_model=Token)
-def refresh_token(
-    *,
-    db: Session = Depends(get_db),
-    refresh_token: RefreshToken,
-) -> Any:
+async def refresh_token(refresh_token: RefreshToken) -> Any:
     """
     Refresh access token using refresh token.
     """
     try:
         payload = security.jwt.decode(
-            refresh_token.refresh_token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
+            refresh_token.refresh_token,
+            SECRET_KEY_BYTES,
+            algorithms=[ALGORITHM],
         )
-        user_id = payload.get("sub")
+        user_id = security.user_id_from_claims(payload)
         token_type = payload.get("type")
         
         if token_type != "refresh":
@@ -88,32 +70,26 @@ def refresh_token(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid token type",
             )
-    except security.jwt.JWTError:
+    except (security.jwt.PyJWTError, KeyError, ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
     
-    user = user_service.get_user(db, user_id=int(user_id))
+    user = await user_service.get_user(Session(), user_id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    refresh_token_expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    
+    access, refresh = security.mint_pair(user.id)
     return {
-        "access_token": security.create_access_token(
-            user.id, expires_delta=access_token_expires
-        ),
-        "refresh_token": security.create_refresh_token(
-            user.id, expires_delta=refresh_token_expires
-        ),
+        "access_token": access,
+        "refresh_token": refresh,
         "token_type": "bearer",
     }
 
 
 @router.post("/test-token", response_model=UserSchema)
-def test_token(current_user: User = Depends(get_current_active_user)) -> Any:
+async def test_token(current_user: User = Depends(get_current_active_user)) -> Any:
     """
     Test access token.
     """
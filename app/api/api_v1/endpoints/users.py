@@ -1,10 +1,9 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.core.deps import get_current_active_user, get_current_active_superuser
-from app.db.database import get_db
+from app.db.database import Session
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate
 from app.services import user_service
@@ -13,19 +12,20 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=UserSchema)
-def read_user_me(
+async def read_user_me(
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get current user.
     """
-    return current_user
+    # Memoized alongside the user cache entry, so it expires together with it
+    body = user_service.get_user_json_cached(current_user)
+    return Response(content=body, media_type="application/json")
 
 
 @router.put("/me", response_model=UserSchema)
-def update_user_me(
+async def update_user_me(
     *,
-    db: Session = Depends(get_db),
     password: str | None = None,
     email: str | None = None,
     current_user: User = Depends(get_current_active_user),
@@ -33,30 +33,36 @@ def update_user_me(
     """
     Update own user.
     """
-    current_user_data = UserSchema.model_validate(current_user)
-    user_in = UserUpdate(**current_user_data.model_dump())
+    # Only the assigned fields are marked as set, so update_user patches just those
+    user_in = UserUpdate()
     if password is not None:
         user_in.password = password
     if email is not None:
         user_in.email = email
-    user = user_service.update_user(db, db_user=current_user, user_update=user_in)
+    user = await user_service.update_user(
+        Session(), db_user=current_user, user_update=user_in
+    )
     return user
 
 
 @router.get("/{user_id}", response_model=UserSchema)
-def read_user_by_id(
+async def read_user_by_id(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
 ) -> Any:
     """
     Get a specific user by id.
     """
-    user = user_service.get_user(db, user_id=user_id)
-    if user == current_user:
-        return user
-    if not user_service.is_superuser(current_user):
+    if user_id == current_user.id:
+        return current_user
+    if not current_user.is_superuser:
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
+    # Core select on the request session's own connection: no identity map,
+    # and no second pool checkout while the session holds one
+    conn = await Session().connection()
+    user = await user_service.read_user(conn, user_id=user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
     return user 
\ No newline at end of file
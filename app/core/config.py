@@ -1,6 +1,9 @@
+import json
 import os
-from typing import List, Union
-from pydantic import AnyHttpUrl, field_validator
+from datetime import timedelta
+from functools import cached_property
+from typing import List, Optional, Tuple, Union
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -22,6 +25,17 @@ class Settings(BaseSettings):
     DB_USER: str
     DB_PASSWORD: str
     DB_NAME: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+
+    # Authenticated user lookups are cached per process; changes made outside
+    # this process (e.g. deactivating a user) show up after at most the TTL
+    USER_CACHE_MAXSIZE: int = 50_000
+    USER_CACHE_TTL_SECONDS: int = 60
+
+    # bcrypt worker processes per app process; defaults to the usable CPUs
+    PASSWORD_POOL_WORKERS: Optional[int] = None
     
     # Project info
     PROJECT_NAME: str = "FastAPI Auth Template"
@@ -29,20 +43,38 @@ class Settings(BaseSettings):
     DESCRIPTION: str = "Production-ready FastAPI template with JWT authentication"
     DEBUG: bool = False
     
-    # CORS
-    BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
+    # CORS: comma-separated origins or a JSON list. Kept as a plain str so
+    # pydantic-settings does not JSON-decode it; parsed once in cors_origins.
+    BACKEND_CORS_ORIGINS: str = ""
 
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
-    def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
-        if isinstance(v, str) and not v.startswith("["):
-            return [i.strip() for i in v.split(",")]
-        elif isinstance(v, (list, str)):
+    def assemble_cors_origins(
+        cls, v: Union[str, List[str], Tuple[str, ...]]
+    ) -> str:
+        if isinstance(v, (list, tuple)):
+            return json.dumps(list(v))
+        elif isinstance(v, str):
             return v
         raise ValueError(v)
 
+    @cached_property
+    def cors_origins(self) -> Tuple[str, ...]:
+        # Plain strings: CORSMiddleware compares origins as-is
+        v = self.BACKEND_CORS_ORIGINS.strip()
+        if v.startswith("["):
+            return tuple(str(i).strip() for i in json.loads(v))
+        return tuple(i.strip() for i in v.split(",") if i.strip())
+
     class Config:
         env_file = ".env"
 
 
-settings = Settings()  # type: ignore 
\ No newline at end of file
+settings = Settings()  # type: ignore
+
+# Snapshot of the values read on every request, so the hot paths use plain
+# module globals instead of going through the settings object each time.
+SECRET_KEY_BYTES: bytes = settings.SECRET_KEY.encode()
+ALGORITHM: str = settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_EXPIRE = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS) 
\ No newline at end of file
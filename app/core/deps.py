@@ -1,53 +1,127 @@
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
+import time
+from functools import lru_cache, partial
+from typing import Optional, Tuple
+
+import jwt
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
 
 from app.core import security
-from app.core.config import settings
-from app.db.database import get_db
+from app.core.config import ALGORITHM, SECRET_KEY_BYTES
+from app.db.database import Session
 from app.models.user import User
 from app.schemas.token import TokenPayload
 from app.services import user_service
 
-reusable_oauth2 = HTTPBearer()
 
+class BearerToken(HTTPBearer):
+    """
+    HTTPBearer that slices the token straight off the Authorization header.
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: HTTPAuthorizationCredentials = Depends(reusable_oauth2)
-) -> User:
+    Subclassing keeps the scheme in the OpenAPI docs (Swagger "Authorize"),
+    but skips building an HTTPAuthorizationCredentials object per request.
+    """
+
+    async def __call__(self, request: Request) -> str:  # type: ignore[override]
+        # Same parsing and errors as HTTPBearer/get_authorization_scheme_param
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated"
+            )
+        scheme, _, credentials = authorization.partition(" ")
+        if not (scheme and credentials):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated"
+            )
+        if scheme.lower() != "bearer":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid authentication credentials",
+            )
+        return credentials
+
+
+bearer_token = BearerToken(scheme_name="HTTPBearer")
+
+# jwt.decode with the key and allowed algorithms bound once at import
+_decode = partial(jwt.decode, key=SECRET_KEY_BYTES, algorithms=(ALGORITHM,))
+
+
+@lru_cache(maxsize=10_000)
+def _decode_token(token: str) -> Tuple[TokenPayload, float]:
+    payload = _decode(token)
+    # The claims are trusted once the signature checks out, so skip validation
+    token_data = TokenPayload.model_construct(
+        sub=security.user_id_from_claims(payload)
+    )
+    return token_data, payload.get("exp", float("inf"))
+
+
+def _decode_cached(token: str) -> TokenPayload:
+    # The signature only has to be verified once per token; a cache hit just
+    # re-checks the expiry, which keeps staleness bounded by the token lifetime.
+    token_data, expire = _decode_token(token)
+    if time.time() >= expire:
+        raise jwt.ExpiredSignatureError("Signature has expired.")
+    return token_data
+
+
+def get_token_payload(request: Request, token: str) -> TokenPayload:
+    # Downstream code can read the verified claims from request.state instead
+    # of decoding the token again.
     try:
-        payload = jwt.decode(
-            token.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
+        token_data = _decode_cached(token)
+    except (jwt.PyJWTError, KeyError, ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = user_service.get_user(db, user_id=token_data.sub)
+    # token_data is shared through the decode cache; hand out a private copy
+    request.state.token_payload = token_data.model_copy()
+    return token_data
+
+
+async def get_current_user(request: Request, token: str) -> User:
+    # Plain helper rather than a dependency: the public dependencies below call
+    # it directly so each protected route resolves a single Depends node.
+    token_data = get_token_payload(request, token)
+    user = await user_service.get_user_cached(Session(), user_id=token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user),
+async def get_current_user_id(
+    request: Request,
+    token: str = Depends(bearer_token),
+) -> int:
+    """
+    Authenticate the request without loading the user row.
+
+    For endpoints that only need the caller's identity; no SQL is issued.
+    Active/superuser status is not checked.
+    """
+    return get_token_payload(request, token).sub
+
+
+async def get_current_active_user(
+    request: Request,
+    token: str = Depends(bearer_token),
 ) -> User:
-    if not user_service.is_active(current_user):
+    current_user = await get_current_user(request, token)
+    if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
-def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
+async def get_current_active_superuser(
+    request: Request,
+    token: str = Depends(bearer_token),
 ) -> User:
-    if not user_service.is_superuser(current_user):
+    current_user = await get_current_user(request, token)
+    if not current_user.is_superuser:
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
         )
-    return current_user 
\ No newline at end of file
+    return current_user
@@ -1,43 +1,188 @@
-from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from typing import Any, Callable, Dict, Tuple, TypeVar, Union, Optional
 
-from jose import jwt
+import jwt
+import orjson
 from passlib.context import CryptContext
 
-from app.core.config import settings
+from app.core.config import (
+    ACCESS_TOKEN_EXPIRE,
+    ALGORITHM,
+    REFRESH_TOKEN_EXPIRE,
+    SECRET_KEY_BYTES,
+    settings,
+)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is CPU bound; worker processes let concurrent logins hash in parallel
+# instead of serializing on the GIL. Created in the app lifespan startup (with
+# a lazy fallback) and shut down with it.
+_password_pool: Optional[ProcessPoolExecutor] = None
 
-ALGORITHM = settings.ALGORITHM
+T = TypeVar("T")
+
+
+def _password_pool_workers() -> int:
+    if settings.PASSWORD_POOL_WORKERS:
+        return settings.PASSWORD_POOL_WORKERS
+    # CPUs this process may be scheduled on (cpuset), not the host's. This does
+    # not see CFS quotas (docker --cpus, k8s CPU limits) and is per uvicorn
+    # worker, so set PASSWORD_POOL_WORKERS explicitly in those deployments.
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def _password_pool_context() -> multiprocessing.context.BaseContext:
+    # Never fork the running server: it has threadpool threads by the time the
+    # first login arrives, and forking a multi-threaded process can deadlock
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def get_password_pool() -> ProcessPoolExecutor:
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = ProcessPoolExecutor(
+            max_workers=_password_pool_workers(),
+            mp_context=_password_pool_context(),
+        )
+    return _password_pool
+
+
+def _discard_password_pool(pool: ProcessPoolExecutor) -> None:
+    global _password_pool
+    # Concurrent callers may all see the same broken pool; only the first one
+    # resets it so a freshly created pool is not thrown away
+    if _password_pool is pool:
+        _password_pool = None
+    pool.shutdown(wait=False)
+
+
+def shutdown_password_pool() -> None:
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown()
+        _password_pool = None
+
+
+async def _run_in_password_pool(func: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    pool = get_password_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed), which leaves the executor unusable
+        # for good; replace it and retry once
+        _discard_password_pool(pool)
+        return await loop.run_in_executor(get_password_pool(), func, *args)
+
+
+# Tokens are signed directly with hmac for the HS* algorithms: the header is
+# constant, so it is encoded once and each mint is one HMAC over the payload.
+# Any other algorithm goes through PyJWT.
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": ALGORITHM, "typ": "JWT"}))
+_JWT_DIGEST = _HMAC_DIGESTS.get(ALGORITHM)
+_ACCESS_TOKEN_SECONDS = ACCESS_TOKEN_EXPIRE.total_seconds()
+_REFRESH_TOKEN_SECONDS = REFRESH_TOKEN_EXPIRE.total_seconds()
+# Keyed once; copying it reuses the key schedule for every signature
+_JWT_HMAC = (
+    hmac.new(SECRET_KEY_BYTES, digestmod=_JWT_DIGEST) if _JWT_DIGEST else None
+)
+
+
+def _encode_jwt(payload: Dict[str, Any]) -> str:
+    if _JWT_HMAC is None:
+        return jwt.encode(payload, SECRET_KEY_BYTES, algorithm=ALGORITHM)
+    signing_input = f"{_JWT_HEADER_B64}.{_b64url(orjson.dumps(payload))}"
+    signer = _JWT_HMAC.copy()
+    signer.update(signing_input.encode("ascii"))
+    return f"{signing_input}.{_b64url(signer.digest())}"
+
+
+def _subject_claims(subject: Union[str, Any]) -> Dict[str, Any]:
+    # "uid" is the numeric user id the API reads back; it is derived for int
+    # and digit-string subjects, anything else is encoded as "sub" alone
+    claims: Dict[str, Any] = {"sub": str(subject)}
+    if isinstance(subject, int):
+        claims["uid"] = subject
+    elif isinstance(subject, str) and subject.isdigit():
+        claims["uid"] = int(subject)
+    return claims
+
+
+def user_id_from_claims(payload: Dict[str, Any]) -> int:
+    """
+    Return the user id carried by a verified token payload.
+
+    Reads the numeric "uid" claim and falls back to parsing "sub" for tokens
+    minted without it. Raises KeyError, ValueError or TypeError when neither
+    holds a usable id.
+    """
+    uid = payload.get("uid")
+    return uid if uid is not None else int(payload["sub"])
 
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    expire = int(time.time() + (expires_delta or ACCESS_TOKEN_EXPIRE).total_seconds())
+    to_encode = {"exp": expire, **_subject_claims(subject)}
+    return _encode_jwt(to_encode)
 
 
 def create_refresh_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(
-            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        )
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    expire = int(time.time() + (expires_delta or REFRESH_TOKEN_EXPIRE).total_seconds())
+    to_encode = {"exp": expire, **_subject_claims(subject), "type": "refresh"}
+    return _encode_jwt(to_encode)
+
+
+def mint_pair(user_id: int) -> Tuple[str, str]:
+    """
+    Return an (access, refresh) token pair for login and refresh.
+
+    Same claims as create_access_token/create_refresh_token with the default
+    lifetimes, sharing the timestamp and subject between both tokens.
+    """
+    now = time.time()
+    sub = str(user_id)
+    access_token = _encode_jwt(
+        {"exp": int(now + _ACCESS_TOKEN_SECONDS), "sub": sub, "uid": user_id}
+    )
+    refresh_token = _encode_jwt(
+        {
+            "exp": int(now + _REFRESH_TOKEN_SECONDS),
+            "sub": sub,
+            "uid": user_id,
+            "type": "refresh",
+        }
+    )
+    return access_token, refresh_token
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -48,11 +193,19 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_password_pool(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_password_pool(get_password_hash, password)
+
+
 def verify_token(token: str) -> Optional[str]:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
+        payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM])
         return payload.get("sub")
-    except jwt.JWTError:
+    except jwt.PyJWTError:
         return None 
\ No newline at end of file
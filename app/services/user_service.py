@@ -1,21 +1,70 @@
 from typing import Optional
-from sqlalchemy.orm import Session
+from weakref import WeakKeyDictionary
+from cachetools import TTLCache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.config import settings
+from app.core.security import get_password_hash_async, verify_password_async
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
 
+_user_cache: TTLCache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+# Serialized public view of each cached instance. Keyed by the instance held
+# in _user_cache, so a body is only reachable while that entry is
+_user_json_cache: "WeakKeyDictionary[User, bytes]" = WeakKeyDictionary()
 
-def get_user(db: Session, user_id: int) -> Optional[User]:
-    return db.query(User).filter(User.id == user_id).first()
+# Only the columns exposed by the public schema (never hashed_password)
+_public_user_columns = [User.__table__.c[name] for name in UserSchema.model_fields]
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    return db.query(User).filter(User.email == email).first()
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    result = await db.execute(select(User).where(User.id == user_id))
+    return result.scalars().first()
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    hashed_password = get_password_hash(user.password)
+async def read_user(conn: AsyncConnection, user_id: int) -> Optional[UserSchema]:
+    # Read-only lookup through Core: no ORM instance or identity map, and the
+    # row is trusted, so the schema is built without validation.
+    result = await conn.execute(
+        select(*_public_user_columns).where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return UserSchema.model_construct(**row._mapping)
+
+
+async def get_user_cached(db: AsyncSession, user_id: int) -> Optional[User]:
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        # Attach a copy to this session without emitting a SELECT
+        return await db.merge(cached, load=False)
+    user = await get_user(db, user_id=user_id)
+    if user is not None:
+        _user_cache[user_id] = user
+    return user
+
+
+def get_user_json_cached(user: User) -> bytes:
+    cached = _user_cache.get(user.id)
+    body = _user_json_cache.get(cached) if cached is not None else None
+    if body is None:
+        body = UserSchema.model_validate(user).model_dump_json().encode()
+        if cached is not None:
+            _user_json_cache[cached] = body
+    return body
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -23,38 +72,38 @@ def create_user(db: Session, user: UserCreate) -> User:
         is_superuser=user.is_superuser,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(db, email=email)
+async def authenticate_user(
+    db: AsyncSession, email: str, password: str
+) -> Optional[User]:
+    user = await get_user_by_email(db, email=email)
     if not user:
         return None
-    if not verify_password(password, str(user.hashed_password)):
+    if not await verify_password_async(password, str(user.hashed_password)):
         return None
     return user
 
 
-def update_user(db: Session, db_user: User, user_update: UserUpdate) -> User:
+async def update_user(
+    db: AsyncSession, db_user: User, user_update: UserUpdate
+) -> User:
+    # Evict before touching the instance, it may be the cached one
+    _user_cache.pop(db_user.id, None)
     update_data = user_update.model_dump(exclude_unset=True)
     if "password" in update_data:
-        hashed_password = get_password_hash(update_data["password"])
+        hashed_password = await get_password_hash_async(update_data["password"])
         del update_data["password"]
         update_data["hashed_password"] = hashed_password
     
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    # A concurrent request may have cached the row as it was before the commit
+    _user_cache.pop(db_user.id, None)
     return db_user
-
-
-def is_active(user: User) -> bool:
-    return bool(user.is_active)
-
-
-def is_superuser(user: User) -> bool:
-    return bool(user.is_superuser) 
\ No newline at end of file